@@ -1,54 +1,128 @@
 #!/usr/bin/env python3
+# Requires PyYAML; when built against libyaml, the C loader is used for
+# faster YAML parsing, otherwise the pure-Python SafeLoader is used.
 import argparse
 import base64
+import errno
+import hashlib
+import http.client
 import json
 import os
+import shutil
 import socket
 import subprocess
 import sys
+import threading
 import time
-import urllib.error
 import urllib.parse
-import urllib.request
-from dataclasses import asdict, dataclass
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
 
-import yaml
+from report_json import write_json
 
 
 REPO_RS_CONFIG = "/srv/work/subconverter-rs/base/pref.example.ini"
 REPO_RS_WORKDIR = "/srv/work/subconverter-rs"
 RELEASE_CONFIG = "/tmp/subconverter-release/subconverter/pref.example.ini"
 RELEASE_WORKDIR = "/tmp/subconverter-release/subconverter"
-
-
-@dataclass
-class HttpResult:
-    status: int
-    content_type: str
-    body: str
-    error: str
+CONFIG_CACHE_DIR = Path(os.environ.get("XDG_CACHE_HOME", "~/.cache")).expanduser() / "subconverter-parity"
+
+# Values applied per --profile to options left unset on the command line.
+_PROFILE_DEFAULTS = {
+    "repo-parity": {
+        "rs_config": REPO_RS_CONFIG,
+        "rs_workdir": REPO_RS_WORKDIR,
+        "out_dir": "scripts/parity-report/repo",
+    },
+    "code-parity": {
+        "rs_config": RELEASE_CONFIG,
+        "rs_workdir": RELEASE_WORKDIR,
+        "out_dir": "scripts/parity-report/code",
+    },
+    "custom": {
+        "rs_config": REPO_RS_CONFIG,
+        "rs_workdir": REPO_RS_WORKDIR,
+        "out_dir": "scripts/parity-report",
+    },
+}
 
 
 def b64_urlsafe_no_pad(value: str) -> str:
     return base64.urlsafe_b64encode(value.encode("utf-8")).decode("ascii").rstrip("=")
 
 
-def http_get(url: str, timeout: int = 20) -> HttpResult:
+# Idle keep-alive connections per (host, port). Connections are checked out
+# for the duration of one request so worker threads never share a socket.
+_CONN_POOL: dict[tuple[str, int], list[http.client.HTTPConnection]] = {}
+_CONN_POOL_LOCK = threading.Lock()
+
+
+def _acquire_conn(key: tuple[str, int], timeout: int) -> tuple[http.client.HTTPConnection, bool]:
+    with _CONN_POOL_LOCK:
+        idle = _CONN_POOL.get(key)
+        conn = idle.pop() if idle else None
+    if conn is None or conn.sock is None:
+        return http.client.HTTPConnection(key[0], key[1], timeout=timeout), False
+    conn.timeout = timeout
+    conn.sock.settimeout(timeout)
+    return conn, True
+
+
+def _release_conn(key: tuple[str, int], conn: http.client.HTTPConnection):
+    with _CONN_POOL_LOCK:
+        _CONN_POOL.setdefault(key, []).append(conn)
+
+
+def close_idle_connections():
+    with _CONN_POOL_LOCK:
+        idle = [conn for conns in _CONN_POOL.values() for conn in conns]
+        _CONN_POOL.clear()
+    for conn in idle:
+        conn.close()
+
+
+def _send_get(conn: http.client.HTTPConnection, target: str) -> tuple[http.client.HTTPResponse, bytes]:
+    conn.request("GET", target, headers={"Connection": "keep-alive"})
+    resp = conn.getresponse()
+    return resp, resp.read()
+
+
+def http_get(url: str, timeout: int = 20) -> dict:
     try:
-        req = urllib.request.Request(url=url, method="GET")
-        with urllib.request.urlopen(req, timeout=timeout) as resp:
-            raw = resp.read()
-            return HttpResult(
-                status=resp.status,
-                content_type=resp.headers.get("content-type", ""),
-                body=raw.decode("utf-8", errors="replace"),
-                error="",
-            )
-    except urllib.error.HTTPError as e:
-        body = e.read().decode("utf-8", errors="replace") if e.fp else ""
-        return HttpResult(status=e.code, content_type=e.headers.get("content-type", ""), body=body, error="")
+        parts = urllib.parse.urlsplit(url)
+        key = (parts.hostname or "127.0.0.1", parts.port or 80)
+        target = parts.path or "/"
+        if parts.query:
+            target += "?" + parts.query
+
+        conn, reused = _acquire_conn(key, timeout)
+        try:
+            try:
+                resp, raw = _send_get(conn, target)
+            except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+                if not reused:
+                    raise
+                # The server dropped an idle pooled connection; retry once on a fresh one.
+                conn.close()
+                conn = http.client.HTTPConnection(key[0], key[1], timeout=timeout)
+                resp, raw = _send_get(conn, target)
+        except Exception:
+            # Never leave a half-used socket open once it is out of the pool.
+            conn.close()
+            raise
+
+        if resp.will_close:
+            conn.close()
+        else:
+            _release_conn(key, conn)
+        return {
+            "status": resp.status,
+            "content_type": resp.getheader("content-type", ""),
+            "body": raw.decode("utf-8", errors="replace"),
+            "error": "",
+        }
     except Exception as e:
-        return HttpResult(status=0, content_type="", body="", error=str(e))
+        return {"status": 0, "content_type": "", "body": "", "error": str(e)}
 
 
 def normalize_text(value: str) -> str:
@@ -58,12 +132,17 @@ def normalize_text(value: str) -> str:
     return "\n".join(lines)
 
 
-def canonicalize(value):
-    if isinstance(value, dict):
-        return {k: canonicalize(value[k]) for k in sorted(value.keys())}
-    if isinstance(value, list):
-        return [canonicalize(v) for v in value]
-    return value
+def canonical_dump(value) -> str:
+    # Key-sorted compact serialization keeps canonicalization in C. Only used
+    # for parsed JSON, whose keys are always strings.
+    return json.dumps(value, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+
+
+def load_yaml(text: str):
+    # Imported lazily so YAML support is only loaded when a YAML case differs.
+    import yaml
+
+    return yaml.load(text, Loader=getattr(yaml, "CSafeLoader", yaml.SafeLoader))
 
 
 def semantic_equal(kind: str, left: str, right: str):
@@ -80,44 +159,132 @@ def semantic_equal(kind: str, left: str, right: str):
             and right_n.endswith(" backend")
         )
         return ok, "version"
+    # Textually identical bodies are equal under every parser; skip parsing.
+    if normalize_text(left) == normalize_text(right):
+        return True, kind if kind in ("json", "yaml") else "text"
     if kind == "json":
-        return canonicalize(json.loads(left)) == canonicalize(json.loads(right)), "json"
+        return canonical_dump(json.loads(left)) == canonical_dump(json.loads(right)), "json"
     if kind == "yaml":
-        return canonicalize(yaml.safe_load(left)) == canonicalize(yaml.safe_load(right)), "yaml"
-    return normalize_text(left) == normalize_text(right), "text"
+        # YAML may carry non-string keys and non-JSON scalars (e.g. dates), so
+        # compare the parsed structures directly.
+        return load_yaml(left) == load_yaml(right), "yaml"
+    return False, "text"
 
 
 def wait_ready(url: str, timeout_sec: int = 45) -> bool:
+    # Back off exponentially from 50ms up to 1s so a fast start is noticed
+    # quickly without hammering a slow one.
+    delay = 0.05
     deadline = time.time() + timeout_sec
     while time.time() < deadline:
         res = http_get(url, timeout=5)
-        if 200 <= res.status < 500:
+        if 200 <= res["status"] < 500:
             return True
-        time.sleep(1)
+        time.sleep(delay)
+        delay = min(delay * 2, 1.0)
     return False
 
 
 def is_port_in_use(port: int, host: str = "127.0.0.1") -> bool:
+    # A bind attempt answers locally without a connect round trip. SO_REUSEADDR
+    # keeps TIME_WAIT leftovers from a previous run from counting as in use.
     with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
-        sock.settimeout(0.5)
-        return sock.connect_ex((host, port)) == 0
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        try:
+            sock.bind((host, port))
+        except OSError as e:
+            return e.errno in (errno.EADDRINUSE, errno.EACCES)
+        return False
+
+
+def write_config(output_config: str, content: bytes):
+    # Replace rather than overwrite in place: output_config may be a hardlink
+    # to a cache entry from an earlier run.
+    tmp = Path(f"{output_config}.{os.getpid()}.tmp")
+    tmp.write_bytes(content)
+    os.replace(tmp, output_config)
+
+
+def install_cached_config(cached: Path, output_config: str):
+    # Hardlink the cached file where possible; removing output_config later
+    # leaves the cache entry intact. The link is made under a temp name and
+    # moved into place so an existing output_config is replaced, never
+    # written through. Fall back to a copy only where linking is unsupported.
+    tmp = Path(f"{output_config}.{os.getpid()}.tmp")
+    tmp.unlink(missing_ok=True)
+    try:
+        os.link(cached, tmp)
+    except OSError as e:
+        if e.errno not in (errno.EXDEV, errno.EPERM):
+            raise
+        shutil.copyfile(cached, tmp)
+    os.replace(tmp, output_config)
+    # rename() is a no-op when both names already link the same inode.
+    tmp.unlink(missing_ok=True)
+
+
+def read_rs_config(source_config: str, rewrite_imports: bool) -> bytes:
+    content = Path(source_config).read_bytes()
+    if rewrite_imports:
+        content = content.replace(b"!!import:snippets/", b"!!import:base/snippets/")
+    return content
+
+
+def store_cached_config(cached: Path, content: bytes, source_hash: str) -> bool:
+    tmp = cached.with_suffix(f".{os.getpid()}.tmp")
+    try:
+        CONFIG_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        tmp.write_bytes(content)
+        os.replace(tmp, cached)
+    except OSError:
+        tmp.unlink(missing_ok=True)
+        return False
+    for stale in CONFIG_CACHE_DIR.glob(f"{source_hash}-*.ini"):
+        if stale != cached:
+            stale.unlink(missing_ok=True)
+    return True
 
 
 def prepare_rs_config(source_config: str, output_config: str):
-    with open(source_config, "r", encoding="utf-8") as f:
-        content = f.read()
+    source_config = os.path.abspath(source_config)
 
     # Keep import paths compatible with the selected workdir layout.
     # Some layouts use "snippets/..." at config root, while this repo uses
     # "base/snippets/...".
-    config_dir = os.path.dirname(os.path.abspath(source_config))
+    config_dir = os.path.dirname(source_config)
     snippets_dir = os.path.join(config_dir, "snippets")
     base_snippets_dir = os.path.join(config_dir, "base", "snippets")
-    if not os.path.isdir(snippets_dir) and os.path.isdir(base_snippets_dir):
-        content = content.replace("!!import:snippets/", "!!import:base/snippets/")
-
-    with open(output_config, "w", encoding="utf-8") as f:
-        f.write(content)
+    rewrite_imports = not os.path.isdir(snippets_dir) and os.path.isdir(base_snippets_dir)
+
+    # The rewritten config only depends on the source file and the layout
+    # check above, so reuse it across runs until the source changes. Entries
+    # are named "<source hash>-<version hash>.ini" so stale versions of the
+    # same source can be pruned.
+    source_hash = hashlib.blake2b(source_config.encode("utf-8"), digest_size=8).hexdigest()
+    for _ in range(2):
+        mtime = os.stat(source_config).st_mtime_ns
+        version = f"{mtime}:{rewrite_imports}"
+        version_hash = hashlib.blake2b(version.encode("utf-8"), digest_size=8).hexdigest()
+        cached = CONFIG_CACHE_DIR / f"{source_hash}-{version_hash}.ini"
+        if not cached.exists():
+            content = read_rs_config(source_config, rewrite_imports)
+            if os.stat(source_config).st_mtime_ns != mtime:
+                # The source changed while being read; the content no longer
+                # matches the key, so use it for this run without caching it.
+                write_config(output_config, content)
+                return
+            if not store_cached_config(cached, content, source_hash):
+                write_config(output_config, content)
+                return
+        try:
+            install_cached_config(cached, output_config)
+            return
+        except FileNotFoundError:
+            # A concurrent run pruned the entry after the exists() check;
+            # regenerate it from the source.
+            continue
+
+    write_config(output_config, read_rs_config(source_config, rewrite_imports))
 
 
 def start_rust_server(port: int, config_path: str, workdir: str):
@@ -173,84 +340,70 @@ def stop_original_docker(container_name: str):
     subprocess.run(["docker", "rm", "-f", container_name], check=False, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
 
 
+def reap_process(process: subprocess.Popen):
+    try:
+        process.wait(timeout=5)
+    except subprocess.TimeoutExpired:
+        process.kill()
+        process.wait()
+
+
+def stop_processes(processes: list[subprocess.Popen]):
+    # Signal everything first, then wait in parallel so a hung process does
+    # not delay reaping the others.
+    for process in processes:
+        process.terminate()
+    with ThreadPoolExecutor(max_workers=max(len(processes), 1)) as executor:
+        for future in [executor.submit(reap_process, p) for p in processes]:
+            future.result()
+
+
+SS_LINK = "ss://YWVzLTI1Ni1nY206cGFzc0BleGFtcGxlLmNvbTo0NDM=#NodeA"
+TROJAN_LINK = "trojan://password@example.org:443#NodeB"
+MIXED_LINK = f"{SS_LINK}|{TROJAN_LINK}"
+RULESET_URL = b64_urlsafe_no_pad("rules/LocalAreaNetwork.list")
+
+_SS_Q = urllib.parse.quote(SS_LINK, safe="")
+_MIXED_Q = urllib.parse.quote(MIXED_LINK, safe="")
+_RULESET_Q = urllib.parse.quote(RULESET_URL, safe="")
+
+# Cases are static, so build them once at import time.
+_CASES = (
+    {"id": "version", "feature": "Version Endpoint", "kind": "version", "path": "/version"},
+    {"id": "sub_clash", "feature": "Sub Basic Clash", "kind": "yaml", "path": f"/sub?target=clash&url={_SS_Q}"},
+    {"id": "sub_ss", "feature": "Sub Basic SS", "kind": "text", "path": f"/sub?target=ss&url={_SS_Q}"},
+    {"id": "sub_quanx", "feature": "Sub QuanX", "kind": "text", "path": f"/sub?target=quanx&url={_SS_Q}"},
+    {"id": "sub_singbox", "feature": "Sub SingBox", "kind": "json", "path": f"/sub?target=singbox&url={_MIXED_Q}"},
+    {"id": "sub_auto", "feature": "Target Auto", "kind": "text", "path": f"/sub?target=auto&url={_SS_Q}"},
+    {
+        "id": "sub_script",
+        "feature": "Clash Script Param",
+        "kind": "yaml",
+        "path": f"/sub?target=clash&script=true&url={_SS_Q}",
+    },
+    {"id": "surge2clash", "feature": "Surge2Clash Endpoint", "kind": "yaml", "path": f"/surge2clash?url={_SS_Q}"},
+    {
+        "id": "getprofile",
+        "feature": "GetProfile Endpoint",
+        "kind": "yaml",
+        "path": "/getprofile?name=profiles/example_profile.ini&token=password",
+    },
+    {
+        "id": "getruleset",
+        "feature": "GetRuleset Endpoint",
+        "kind": "text",
+        "path": f"/getruleset?type=1&url={_RULESET_Q}&group=DIRECT",
+    },
+    {"id": "render", "feature": "Render Endpoint", "kind": "text", "path": "/render?path=base/all_base.tpl"},
+    {"id": "alias_clash", "feature": "Alias Endpoint Clash", "kind": "yaml", "path": f"/clash?url={_SS_Q}"},
+)
+
+
 def build_cases():
-    ss_link = "ss://YWVzLTI1Ni1nY206cGFzc0BleGFtcGxlLmNvbTo0NDM=#NodeA"
-    trojan_link = "trojan://password@example.org:443#NodeB"
-    mixed_link = f"{ss_link}|{trojan_link}"
-    ruleset_url = b64_urlsafe_no_pad("rules/LocalAreaNetwork.list")
-
-    return [
-        {"id": "version", "feature": "Version Endpoint", "kind": "version", "path": "/version"},
-        {
-            "id": "sub_clash",
-            "feature": "Sub Basic Clash",
-            "kind": "yaml",
-            "path": f"/sub?target=clash&url={urllib.parse.quote(ss_link, safe='')}",
-        },
-        {
-            "id": "sub_ss",
-            "feature": "Sub Basic SS",
-            "kind": "text",
-            "path": f"/sub?target=ss&url={urllib.parse.quote(ss_link, safe='')}",
-        },
-        {
-            "id": "sub_quanx",
-            "feature": "Sub QuanX",
-            "kind": "text",
-            "path": f"/sub?target=quanx&url={urllib.parse.quote(ss_link, safe='')}",
-        },
-        {
-            "id": "sub_singbox",
-            "feature": "Sub SingBox",
-            "kind": "json",
-            "path": f"/sub?target=singbox&url={urllib.parse.quote(mixed_link, safe='')}",
-        },
-        {
-            "id": "sub_auto",
-            "feature": "Target Auto",
-            "kind": "text",
-            "path": f"/sub?target=auto&url={urllib.parse.quote(ss_link, safe='')}",
-        },
-        {
-            "id": "sub_script",
-            "feature": "Clash Script Param",
-            "kind": "yaml",
-            "path": f"/sub?target=clash&script=true&url={urllib.parse.quote(ss_link, safe='')}",
-        },
-        {
-            "id": "surge2clash",
-            "feature": "Surge2Clash Endpoint",
-            "kind": "yaml",
-            "path": f"/surge2clash?url={urllib.parse.quote(ss_link, safe='')}",
-        },
-        {
-            "id": "getprofile",
-            "feature": "GetProfile Endpoint",
-            "kind": "yaml",
-            "path": "/getprofile?name=profiles/example_profile.ini&token=password",
-        },
-        {
-            "id": "getruleset",
-            "feature": "GetRuleset Endpoint",
-            "kind": "text",
-            "path": f"/getruleset?type=1&url={urllib.parse.quote(ruleset_url, safe='')}&group=DIRECT",
-        },
-        {
-            "id": "render",
-            "feature": "Render Endpoint",
-            "kind": "text",
-            "path": "/render?path=base/all_base.tpl",
-        },
-        {
-            "id": "alias_clash",
-            "feature": "Alias Endpoint Clash",
-            "kind": "yaml",
-            "path": f"/clash?url={urllib.parse.quote(ss_link, safe='')}",
-        },
-    ]
+    return _CASES
 
 
-def main():
+def build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(description="Semantic parity compare: subconverter vs subconverter-rs")
     parser.add_argument("--orig-port", type=int, default=19500)
     parser.add_argument("--rs-port", type=int, default=19501)
@@ -276,29 +429,13 @@ def main():
     )
     parser.add_argument("--no-start", action="store_true", help="Use already running services")
     parser.add_argument("--keep-running", action="store_true", help="Do not stop services after compare")
-    args = parser.parse_args()
-
-    if args.profile == "repo-parity":
-        if args.rs_config is None:
-            args.rs_config = REPO_RS_CONFIG
-        if args.rs_workdir is None:
-            args.rs_workdir = REPO_RS_WORKDIR
-        if args.out_dir is None:
-            args.out_dir = "scripts/parity-report/repo"
-    elif args.profile == "code-parity":
-        if args.rs_config is None:
-            args.rs_config = RELEASE_CONFIG
-        if args.rs_workdir is None:
-            args.rs_workdir = RELEASE_WORKDIR
-        if args.out_dir is None:
-            args.out_dir = "scripts/parity-report/code"
-    else:
-        if args.rs_config is None:
-            args.rs_config = REPO_RS_CONFIG
-        if args.rs_workdir is None:
-            args.rs_workdir = REPO_RS_WORKDIR
-        if args.out_dir is None:
-            args.out_dir = "scripts/parity-report"
+    return parser
+
+
+def run(args: argparse.Namespace) -> dict:
+    for key, value in _PROFILE_DEFAULTS[args.profile].items():
+        if getattr(args, key) is None:
+            setattr(args, key, value)
 
     os.makedirs(args.out_dir, exist_ok=True)
 
@@ -328,37 +465,53 @@ def main():
             orig_proc = start_original_local(args.orig_port, args.orig_bin, args.orig_config, args.orig_workdir)
 
     try:
-        if not wait_ready(orig_base + "/version"):
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            orig_ready = executor.submit(wait_ready, orig_base + "/version")
+            rs_ready = executor.submit(wait_ready, rs_base + "/")
+        if not orig_ready.result():
             raise RuntimeError("Original subconverter did not become ready")
-        if not wait_ready(rs_base + "/"):
+        if not rs_ready.result():
             raise RuntimeError("subconverter-rs did not become ready")
 
+        cases = build_cases()
+        # Requests are independent and dominated by server latency, so fan them
+        # out; comparison stays on the main thread in case order.
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            futures = {
+                case["id"]: (
+                    executor.submit(http_get, orig_base + case["path"]),
+                    executor.submit(http_get, rs_base + case["path"]),
+                )
+                for case in cases
+            }
+
         results = []
-        for case in build_cases():
-            orig_res = http_get(orig_base + case["path"])
-            rs_res = http_get(rs_base + case["path"])
+        for case in cases:
+            orig_future, rs_future = futures[case["id"]]
+            orig_res = orig_future.result()
+            rs_res = rs_future.result()
 
             case_result = {
                 "id": case["id"],
                 "feature": case["feature"],
                 "kind": case["kind"],
                 "path": case["path"],
-                "original": asdict(orig_res),
-                "rust": asdict(rs_res),
+                "original": orig_res,
+                "rust": rs_res,
             }
 
-            if orig_res.status == 0 or rs_res.status == 0:
+            if orig_res["status"] == 0 or rs_res["status"] == 0:
                 case_result["status"] = "FAIL"
                 case_result["note"] = "request_error"
-            elif orig_res.status >= 400:
+            elif orig_res["status"] >= 400:
                 case_result["status"] = "SKIP"
                 case_result["note"] = "original_case_invalid"
-            elif rs_res.status >= 400:
+            elif rs_res["status"] >= 400:
                 case_result["status"] = "FAIL"
                 case_result["note"] = "rust_http_error"
             else:
                 try:
-                    equal, mode = semantic_equal(case["kind"], orig_res.body, rs_res.body)
+                    equal, mode = semantic_equal(case["kind"], orig_res["body"], rs_res["body"])
                     case_result["compare_mode"] = mode
                     case_result["status"] = "PASS" if equal else "PARTIAL"
                     case_result["note"] = "semantic_match" if equal else "semantic_diff"
@@ -377,65 +530,64 @@ def main():
         }
 
         json_path = os.path.join(args.out_dir, "compat_report.json")
-        with open(json_path, "w", encoding="utf-8") as f:
-            json.dump(
-                {
-                    "profile": args.profile,
-                    "settings": {
-                        "rs_config": args.rs_config,
-                        "rs_workdir": args.rs_workdir,
-                        "orig_mode": args.orig_mode,
-                        "orig_config": args.orig_config,
-                        "orig_workdir": args.orig_workdir,
-                    },
-                    "summary": summary,
-                    "results": results,
+        write_json(
+            json_path,
+            {
+                "profile": args.profile,
+                "settings": {
+                    "rs_config": args.rs_config,
+                    "rs_workdir": args.rs_workdir,
+                    "orig_mode": args.orig_mode,
+                    "orig_config": args.orig_config,
+                    "orig_workdir": args.orig_workdir,
                 },
-                f,
-                ensure_ascii=False,
-                indent=2,
-            )
+                "summary": summary,
+                "results": results,
+            },
+        )
 
         md_path = os.path.join(args.out_dir, "compat_report.md")
-        with open(md_path, "w", encoding="utf-8") as f:
-            f.write("# Subconverter Parity Report\n\n")
-            f.write("Semantic compare between original subconverter and subconverter-rs.\n\n")
-            f.write(f"- Profile: {args.profile}\n")
-            f.write(f"- Rust config: `{args.rs_config}`\n")
-            f.write(f"- Rust workdir: `{args.rs_workdir}`\n")
-            f.write(
-                f"- Total: {summary['total']}\n- PASS: {summary['PASS']}\n- PARTIAL: {summary['PARTIAL']}\n- FAIL: {summary['FAIL']}\n- SKIP: {summary['SKIP']}\n\n"
-            )
-            f.write("| Case | Feature | Status | Original | Rust | Note |\n")
-            f.write("| --- | --- | --- | --- | --- | --- |\n")
-            for r in results:
-                f.write(
-                    f"| `{r['id']}` | {r['feature']} | {r['status']} | {r['original']['status']} | {r['rust']['status']} | {r['note']} |\n"
-                )
+        lines = [
+            "# Subconverter Parity Report",
+            "",
+            "Semantic compare between original subconverter and subconverter-rs.",
+            "",
+            f"- Profile: {args.profile}",
+            f"- Rust config: `{args.rs_config}`",
+            f"- Rust workdir: `{args.rs_workdir}`",
+            f"- Total: {summary['total']}",
+            f"- PASS: {summary['PASS']}",
+            f"- PARTIAL: {summary['PARTIAL']}",
+            f"- FAIL: {summary['FAIL']}",
+            f"- SKIP: {summary['SKIP']}",
+            "",
+            "| Case | Feature | Status | Original | Rust | Note |",
+            "| --- | --- | --- | --- | --- | --- |",
+        ]
+        lines.extend(
+            f"| `{r['id']}` | {r['feature']} | {r['status']} | {r['original']['status']} | {r['rust']['status']} | {r['note']} |"
+            for r in results
+        )
+        Path(md_path).write_text("\n".join(lines) + "\n", encoding="utf-8")
 
         print(f"[ok] report json: {json_path}")
         print(f"[ok] report md:   {md_path}")
         print(f"[ok] summary: {summary}")
+        return summary
 
     finally:
+        close_idle_connections()
         if not args.keep_running:
-            if rust_proc is not None:
-                rust_proc.terminate()
-                try:
-                    rust_proc.wait(timeout=5)
-                except Exception:
-                    rust_proc.kill()
-            if orig_proc is not None:
-                orig_proc.terminate()
-                try:
-                    orig_proc.wait(timeout=5)
-                except Exception:
-                    orig_proc.kill()
+            stop_processes([p for p in (rust_proc, orig_proc) if p is not None])
             if not args.no_start and args.orig_mode == "docker":
                 stop_original_docker(container_name)
             if os.path.exists(rs_temp_config):
                 os.remove(rs_temp_config)
 
 
+def main():
+    run(build_parser().parse_args())
+
+
 if __name__ == "__main__":
     main()
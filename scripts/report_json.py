@@ -0,0 +1,14 @@
+import json
+from pathlib import Path
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def write_json(path, data) -> None:
+    if orjson is not None:
+        Path(path).write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+    else:
+        Path(path).write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding="utf-8")
@@ -1,17 +1,41 @@
 import argparse
-import json
+import hashlib
+import math
 import os
+import re
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
+from report_json import write_json
+
+
+POOL_MIN_PAIRS = 64
+POOL_CHUNKSIZE = 16
+
+# Only CR/LF delimit lines; str.splitlines() would also split on form feeds
+# and Unicode separators.
+_LINE_RE = re.compile(r"[^\r\n]+")
+
 
 def normalize_lines(content: str) -> list[str]:
-    return [line.strip() for line in content.replace("\r\n", "\n").replace("\r", "\n").split("\n") if line.strip()]
+    return [line for line in (m.strip() for m in _LINE_RE.findall(content)) if line]
 
 
 def read_text(path: Path) -> str:
     return path.read_text(encoding="utf-8", errors="replace")
 
 
+def file_digest(path: Path) -> bytes:
+    with path.open("rb") as f:
+        if hasattr(hashlib, "file_digest"):
+            return hashlib.file_digest(f, lambda: hashlib.blake2b(digest_size=16)).digest()
+        h = hashlib.blake2b(digest_size=16)
+        for chunk in iter(lambda: f.read(65536), b""):
+            h.update(chunk)
+        return h.digest()
+
+
 def parse_ruleset_paths(rulesets_file: Path) -> list[str]:
     lines = normalize_lines(read_text(rulesets_file))
     paths: list[str] = []
@@ -41,58 +65,76 @@ def compare_file_pair(left: Path, right: Path) -> dict:
         result["equal"] = False
         return result
 
+    # Byte-identical files need no line diff; count lines from one side only.
+    if left.stat().st_size == right.stat().st_size and file_digest(left) == file_digest(right):
+        line_count = len(normalize_lines(read_text(left)))
+        result.update(
+            {
+                "equal": True,
+                "left_line_count": line_count,
+                "right_line_count": line_count,
+                "extra_in_left": 0,
+                "extra_in_right": 0,
+                "sample_extra_in_left": [],
+                "sample_extra_in_right": [],
+            }
+        )
+        return result
+
     left_lines = normalize_lines(read_text(left))
     right_lines = normalize_lines(read_text(right))
-    left_set = set(left_lines)
-    right_set = set(right_lines)
+    # Multiset difference so duplicated lines are counted, not collapsed.
+    left_counts = Counter(left_lines)
+    right_counts = Counter(right_lines)
+    extra_in_left = left_counts - right_counts
+    extra_in_right = right_counts - left_counts
 
     result.update(
         {
             "equal": left_lines == right_lines,
             "left_line_count": len(left_lines),
             "right_line_count": len(right_lines),
-            "extra_in_left": len(left_set - right_set),
-            "extra_in_right": len(right_set - left_set),
-            "sample_extra_in_left": sorted(list(left_set - right_set))[:8],
-            "sample_extra_in_right": sorted(list(right_set - left_set))[:8],
+            "extra_in_left": sum(extra_in_left.values()),
+            "extra_in_right": sum(extra_in_right.values()),
+            "sample_extra_in_left": sorted(extra_in_left)[:8],
+            "sample_extra_in_right": sorted(extra_in_right)[:8],
         }
     )
     return result
 
 
-def main():
+def compare_entry(args: tuple[Path, Path, str, str]) -> dict:
+    left, right, rel_path, kind = args
+    return {"kind": kind, "path": rel_path, **compare_file_pair(left, right)}
+
+
+def build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(description="Compare repo resource files against release resource files")
     parser.add_argument("--repo-root", default="/srv/work/subconverter-rs/base")
     parser.add_argument("--release-root", default="/tmp/subconverter-release/subconverter")
     parser.add_argument("--out-dir", default="scripts/parity-report/resources")
-    args = parser.parse_args()
+    return parser
 
+
+def run(args: argparse.Namespace) -> dict:
     repo_root = Path(args.repo_root)
     release_root = Path(args.release_root)
     out_dir = Path(args.out_dir)
     out_dir.mkdir(parents=True, exist_ok=True)
 
-    compare_entries: list[dict] = []
-
     snippet_files = ["snippets/rulesets.txt", "snippets/groups.txt"]
-    for rel_path in snippet_files:
-        compare_entries.append(
-            {
-                "kind": "snippet",
-                "path": rel_path,
-                **compare_file_pair(repo_root / rel_path, release_root / rel_path),
-            }
-        )
-
     ruleset_paths = parse_ruleset_paths(release_root / "snippets/rulesets.txt")
-    for rel_path in ruleset_paths:
-        compare_entries.append(
-            {
-                "kind": "ruleset",
-                "path": rel_path,
-                **compare_file_pair(repo_root / rel_path, release_root / rel_path),
-            }
-        )
+    pairs = [(repo_root / p, release_root / p, p, "snippet") for p in snippet_files]
+    pairs += [(repo_root / p, release_root / p, p, "ruleset") for p in ruleset_paths]
+
+    # Comparisons are independent CPU/disk work; spread them across processes
+    # only when there are enough to outweigh the cost of starting workers.
+    if len(pairs) > POOL_MIN_PAIRS:
+        max_workers = min(os.cpu_count() or 1, math.ceil(len(pairs) / POOL_CHUNKSIZE))
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            compare_entries = list(executor.map(compare_entry, pairs, chunksize=POOL_CHUNKSIZE))
+    else:
+        compare_entries = list(map(compare_entry, pairs))
 
     summary = {
         "total": len(compare_entries),
@@ -104,39 +146,46 @@ def main():
     }
 
     json_path = out_dir / "resource_diff.json"
-    json_path.write_text(
-        json.dumps(
-            {
-                "repo_root": str(repo_root),
-                "release_root": str(release_root),
-                "summary": summary,
-                "entries": compare_entries,
-            },
-            ensure_ascii=False,
-            indent=2,
-        ),
-        encoding="utf-8",
+    write_json(
+        json_path,
+        {
+            "repo_root": str(repo_root),
+            "release_root": str(release_root),
+            "summary": summary,
+            "entries": compare_entries,
+        },
     )
 
     md_path = out_dir / "resource_diff.md"
-    with md_path.open("w", encoding="utf-8") as f:
-        f.write("# Resource Diff Report\n\n")
-        f.write("Repo resources compared with release resources.\n\n")
-        f.write(f"- Repo root: `{repo_root}`\n")
-        f.write(f"- Release root: `{release_root}`\n")
-        f.write(
-            f"- Total files: {summary['total']}\n- Equal: {summary['equal']}\n- Different: {summary['different']}\n- Missing: {summary['missing']}\n\n"
-        )
-        f.write("| Kind | Path | Equal | Repo lines | Release lines | Repo-only | Release-only |\n")
-        f.write("| --- | --- | --- | ---: | ---: | ---: | ---: |\n")
-        for e in compare_entries:
-            f.write(
-                f"| {e['kind']} | `{e['path']}` | {e.get('equal', False)} | {e.get('left_line_count', '-') } | {e.get('right_line_count', '-') } | {e.get('extra_in_left', '-') } | {e.get('extra_in_right', '-') } |\n"
-            )
+    lines = [
+        "# Resource Diff Report",
+        "",
+        "Repo resources compared with release resources.",
+        "",
+        f"- Repo root: `{repo_root}`",
+        f"- Release root: `{release_root}`",
+        f"- Total files: {summary['total']}",
+        f"- Equal: {summary['equal']}",
+        f"- Different: {summary['different']}",
+        f"- Missing: {summary['missing']}",
+        "",
+        "| Kind | Path | Equal | Repo lines | Release lines | Repo-only | Release-only |",
+        "| --- | --- | --- | ---: | ---: | ---: | ---: |",
+    ]
+    lines.extend(
+        f"| {e['kind']} | `{e['path']}` | {e.get('equal', False)} | {e.get('left_line_count', '-') } | {e.get('right_line_count', '-') } | {e.get('extra_in_left', '-') } | {e.get('extra_in_right', '-') } |"
+        for e in compare_entries
+    )
+    md_path.write_text("\n".join(lines) + "\n", encoding="utf-8")
 
     print(f"[ok] report json: {json_path}")
     print(f"[ok] report md:   {md_path}")
     print(f"[ok] summary: {summary}")
+    return summary
+
+
+def main():
+    run(build_parser().parse_args())
 
 
 if __name__ == "__main__":
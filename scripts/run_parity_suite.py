@@ -1,21 +1,16 @@
 import argparse
 import json
-import subprocess
 import time
 from pathlib import Path
 
+from report_json import write_json
+
 
 CODE_REPORT_JSON = Path("scripts/parity-report/code/compat_report.json")
 REPO_REPORT_JSON = Path("scripts/parity-report/repo/compat_report.json")
 RESOURCE_REPORT_JSON = Path("scripts/parity-report/resources/resource_diff.json")
 
 
-def run_cmd(command: list[str]) -> None:
-    result = subprocess.run(command, check=False)
-    if result.returncode != 0:
-        raise RuntimeError(f"command failed ({result.returncode}): {' '.join(command)}")
-
-
 def read_json(path: Path) -> dict:
     if not path.exists():
         raise RuntimeError(f"expected report not found: {path}")
@@ -27,21 +22,28 @@ def write_suite_reports(summary: dict) -> tuple[Path, Path]:
     out_dir.mkdir(parents=True, exist_ok=True)
 
     json_path = out_dir / "summary.json"
-    json_path.write_text(json.dumps(summary, ensure_ascii=False, indent=2), encoding="utf-8")
+    write_json(json_path, summary)
 
     md_path = out_dir / "summary.md"
-    with md_path.open("w", encoding="utf-8") as f:
-        f.write("# Parity Suite Summary\n\n")
-        f.write(f"- Generated at: {summary['generated_at']}\n")
-        f.write(f"- Code parity: {summary['code_parity']}\n")
-        f.write(f"- Repo parity: {summary['repo_parity']}\n")
-        f.write(f"- Resource diff: {summary['resource_diff']}\n\n")
-        if "strict" in summary:
-            f.write(f"- Strict mode: {summary['strict']}\n\n")
-        f.write("## Source Reports\n\n")
-        f.write(f"- `{CODE_REPORT_JSON}`\n")
-        f.write(f"- `{REPO_REPORT_JSON}`\n")
-        f.write(f"- `{RESOURCE_REPORT_JSON}`\n")
+    lines = [
+        "# Parity Suite Summary",
+        "",
+        f"- Generated at: {summary['generated_at']}",
+        f"- Code parity: {summary['code_parity']}",
+        f"- Repo parity: {summary['repo_parity']}",
+        f"- Resource diff: {summary['resource_diff']}",
+        "",
+    ]
+    if "strict" in summary:
+        lines += [f"- Strict mode: {summary['strict']}", ""]
+    lines += [
+        "## Source Reports",
+        "",
+        f"- `{CODE_REPORT_JSON}`",
+        f"- `{REPO_REPORT_JSON}`",
+        f"- `{RESOURCE_REPORT_JSON}`",
+    ]
+    md_path.write_text("\n".join(lines) + "\n", encoding="utf-8")
 
     return json_path, md_path
 
@@ -58,14 +60,22 @@ def main() -> None:
     )
     args = parser.parse_args()
 
+    # Stages run in-process with each script's own CLI defaults. Their modules
+    # are imported only when a stage runs, so skipped stages cost nothing.
     if not args.skip_code_parity:
-        run_cmd(["python3", "scripts/compare_with_subconverter.py", "--profile", "code-parity"])
+        import compare_with_subconverter
+
+        compare_with_subconverter.run(compare_with_subconverter.build_parser().parse_args(["--profile", "code-parity"]))
 
     if not args.skip_repo_parity:
-        run_cmd(["python3", "scripts/compare_with_subconverter.py", "--profile", "repo-parity"])
+        import compare_with_subconverter
+
+        compare_with_subconverter.run(compare_with_subconverter.build_parser().parse_args(["--profile", "repo-parity"]))
 
     if not args.skip_resource_diff:
-        run_cmd(["python3", "scripts/report_resource_diff.py"])
+        import report_resource_diff
+
+        report_resource_diff.run(report_resource_diff.build_parser().parse_args([]))
 
     code_summary = read_json(CODE_REPORT_JSON).get("summary", {}) if CODE_REPORT_JSON.exists() else {}
     repo_summary = read_json(REPO_REPORT_JSON).get("summary", {}) if REPO_REPORT_JSON.exists() else {}